@@ -12,13 +12,77 @@
 
 import os
 import sys
-import time
 import random
+import socket
+import ssl
+import hashlib
+import logging
+import asyncio
+import httpx
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 import click
 import trafilatura
+import lxml.html
+import idna
 import re
-from datetime import datetime
-from urllib.parse import urlparse
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse, urlsplit, urlunsplit
+
+logger = logging.getLogger("url2md")
+
+# Browser identities rotated per request; the rest of the headers never change
+_USER_AGENTS = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.3 Safari/605.1.15',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:123.0) Gecko/20100101 Firefox/123.0',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+)
+_BASE_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+# Retry pauses, in seconds
+_MAX_BACKOFF = 60
+_RATE_LIMIT_DELAY = 5.0
+
+class _SafeCharTable(dict):
+    """str.translate table keeping alphanumerics plus a few extra characters.
+    
+    Code points are classified on first sight and cached, so translate()
+    stays a C-level dict lookup per character after warm-up.
+    """
+    
+    def __init__(self, extra):
+        super().__init__()
+        self.extra = extra
+        for codepoint in range(128):
+            self[codepoint]
+    
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        # Mapping to None deletes the character, mapping to itself keeps it
+        value = codepoint if char.isalnum() or char in self.extra else None
+        self[codepoint] = value
+        return value
+
+_SAFE_FILENAME_TABLE = _SafeCharTable(' -_')
+
+# Query parameters that never change which article a URL points to
+_TRACKING_PARAM_PREFIXES = ('utm_',)
+_TRACKING_PARAMS = frozenset({'fbclid', 'gclid', 'mc_cid', 'mc_eid'})
+
+# Markup that opens an HTML file; markdown may mention tags, but never starts with one
+_HTML_MARKERS = ('<!doctype', '<html')
+_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+# Patterns compiled once at import instead of on every call
+# Markdown links [text](url) or plain URLs, matched in a single pass
+_URL_ANY = re.compile(r'\[(?:[^\]]+)\]\((?P<md>[^)]+)\)|(?P<plain>https?://[^\s<>"]+)')
 
 def sanitize_filename(url):
     """Create a sanitized filename from the URL."""
@@ -38,7 +102,7 @@ def sanitize_filename(url):
     
     # Remove any file extensions and invalid characters
     filename = os.path.splitext(filename)[0]
-    filename = "".join(c for c in filename if c.isalnum() or c in (' ', '-', '_'))
+    filename = filename.translate(_SAFE_FILENAME_TABLE)
     
     # If filename is empty after sanitization, use domain
     if not filename:
@@ -51,145 +115,384 @@ def sanitize_filename(url):
     
     return filename
 
-def extract_article(url, max_retries=3):
+def unique_filenames(urls):
+    """Map each URL to its filename, keeping URLs that sanitize alike apart."""
+    names = {url: sanitize_filename(url) for url in urls}
+    counts = Counter(names.values())
+    for url, name in names.items():
+        query = urlsplit(url).query
+        if counts[name] > 1 and query:
+            # Pages told apart only by their query, e.g. story.php?id=1 and ?id=2
+            digest = hashlib.sha256(query.encode('utf-8')).hexdigest()[:8]
+            names[url] = f"{name}_{digest}"
+            
+    # Anything still shared would have one article overwrite another
+    counts = Counter(names.values())
+    for url, name in names.items():
+        if counts[name] > 1:
+            logger.warning("%s shares the filename %s.md with another URL and may overwrite it", url, name)
+    return names
+
+def parse_article(downloaded):
+    """Extract content and metadata from a downloaded webpage."""
+    # Parse the HTML once and share the tree between both extraction passes
+    tree = trafilatura.load_html(downloaded)
+    if tree is None:
+        return None
+        
+    # Extract metadata first, as extract() prunes its own copy of the tree
+    metadata = trafilatura.extract_metadata(tree)
+    
+    # Extract content
+    content = trafilatura.extract(
+        tree,
+        include_links=True,
+        include_images=True,
+        include_tables=True
+    )
+    
+    if not content:
+        return None
+        
+    # Handle metadata fields
+    title = metadata.title if metadata and hasattr(metadata, 'title') else 'Untitled'
+    authors = metadata.authors if metadata and hasattr(metadata, 'authors') else []
+    publish_date = metadata.date if metadata and hasattr(metadata, 'date') else datetime.now().strftime("%Y-%m-%d")
+    
+    return {
+        'title': title,
+        'content': content,
+        'authors': authors,
+        'publish_date': publish_date
+    }
+
+def get_random_user_agent():
+    """Pick a browser User-Agent for the next request."""
+    return random.choice(_USER_AGENTS)
+
+def retry_after_seconds(headers):
+    """Return the delay requested by a Retry-After header in seconds, or None."""
+    value = headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    # HTTP-date form
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+def backoff_delay(attempt):
+    """Return the pause before retrying after a transient failure."""
+    # Exponential backoff with full jitter
+    return random.uniform(0, min(_MAX_BACKOFF, 2 ** attempt))
+
+def retry_delay(response, attempt):
+    """Return how long to wait before retrying an HTTP error, or None to give up."""
+    status = response.status_code
+    if status != 429 and status < 500:
+        # Client errors will not change on retry
+        return None
+    delay = backoff_delay(attempt)
+    # Honor the server's requested pause, and never hammer a rate limit
+    retry_after = retry_after_seconds(response.headers)
+    if retry_after is None and status == 429:
+        retry_after = _RATE_LIMIT_DELAY
+    if retry_after is not None:
+        delay = max(delay, min(_MAX_BACKOFF, retry_after))
+    return delay
+
+def is_html_response(response):
+    """Check whether a response body is a web page worth handing to trafilatura."""
+    content_type = response.headers.get('Content-Type', '').lower()
+    # Servers that omit the header usually still send HTML; feeds and other
+    # XML types (rss+xml, atom+xml, text/xml) are not articles
+    return not content_type or 'text/html' in content_type or 'application/xhtml+xml' in content_type
+
+def is_permanent_error(exc):
+    """Check whether a transport error will not go away on retry."""
+    # httpx wraps the underlying socket error, so walk the exception chain
+    while exc is not None:
+        if isinstance(exc, socket.gaierror) and exc.errno == socket.EAI_NONAME:
+            # A host that does not resolve will not appear on retry
+            return True
+        if isinstance(exc, ssl.SSLCertVerificationError):
+            # Nor will a bad certificate fix itself between attempts
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+def html_cache_path(cache_dir, url):
+    """Return the file caching a URL's downloaded HTML."""
+    digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.html")
+
+def read_cached_html(cache_dir, url):
+    """Return the cached HTML for a URL, or None if caching is off or missing."""
+    if not cache_dir:
+        return None
+    try:
+        with open(html_cache_path(cache_dir, url), 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        # An unreadable cache entry just means downloading the page again
+        logger.warning("Could not read cached HTML for %s: %s", url, e)
+        return None
+
+def write_cached_html(cache_dir, url, html):
+    """Cache a URL's downloaded HTML for later runs."""
+    if not cache_dir:
+        return
+    # Rename into place so an interrupted write is never read back as a page
+    path = html_cache_path(cache_dir, url)
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(html)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # The cache is only an optimization, so never lose a good download to it
+        logger.warning("Could not cache HTML for %s: %s", url, e)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def extract_article(url, max_retries=3, cache_dir=None):
     """Extract article content using trafilatura."""
+    # A single URL is just a batch of one, so both paths share one retry loop
+    [(_, article)] = asyncio.run(fetch_all([url], cache_dir=cache_dir, max_retries=max_retries))
+    return article
+
+async def fetch_article(client, sem, pool, url, max_retries=3, cache_dir=None):
+    """Download a webpage and extract its article content in a worker process."""
+    loop = asyncio.get_running_loop()
+    
+    # Reuse a previous run's download when one is cached
+    cached = read_cached_html(cache_dir, url)
+    if cached is not None:
+        article = await loop.run_in_executor(pool, parse_article, cached)
+        if article:
+            return article
+            
+    last_error = None
     for attempt in range(max_retries):
+        delay = backoff_delay(attempt)
         try:
-            print(f"Attempt {attempt + 1} of {max_retries}...")
+            logger.info("Attempt %d of %d for %s...", attempt + 1, max_retries, url)
             
-            # Download the webpage
-            downloaded = trafilatura.fetch_url(url)
-            
-            if not downloaded:
-                print("Failed to download the webpage")
-                continue
+            # Only hold the semaphore while the request is in flight
+            async with sem:
+                # The client carries _BASE_HEADERS, so only the UA is per-request
+                headers = {'User-Agent': get_random_user_agent()}
+                async with client.stream('GET', url, headers=headers) as response:
+                    # Check the headers before the body, so error pages, PDFs,
+                    # videos and archives are closed without being downloaded
+                    if response.status_code < 400 and is_html_response(response):
+                        await response.aread()
                 
-            # Extract content
-            content = trafilatura.extract(
-                downloaded,
-                include_links=True,
-                include_images=True,
-                include_tables=True
-            )
-            
-            if not content:
-                print("Failed to extract content")
-                continue
+            if response.status_code >= 400:
+                delay = retry_delay(response, attempt)
+                if delay is None:
+                    logger.warning("HTTP %d for %s, not retrying", response.status_code, url)
+                    return None
+                logger.info("HTTP %d on attempt %d for %s", response.status_code, attempt + 1, url)
+                last_error = f"HTTP {response.status_code}"
+            elif not is_html_response(response):
+                # PDFs, images and feeds will not turn into HTML on retry
+                logger.warning("Not a web page (%s), skipping %s", response.headers['Content-Type'], url)
+                return None
+            else:
+                write_cached_html(cache_dir, url, response.content)
                 
-            # Extract metadata
-            metadata = trafilatura.extract_metadata(downloaded)
-            
-            # Handle metadata fields
-            title = metadata.title if metadata and hasattr(metadata, 'title') else 'Untitled'
-            authors = metadata.authors if metadata and hasattr(metadata, 'authors') else []
-            publish_date = metadata.date if metadata and hasattr(metadata, 'date') else datetime.now().strftime("%Y-%m-%d")
-            
-            return {
-                'title': title,
-                'content': content,
-                'authors': authors,
-                'publish_date': publish_date
-            }
-            
+                # Parse off the event loop so other downloads keep progressing;
+                # in a batch, separate pages parse on separate cores
+                article = await loop.run_in_executor(pool, parse_article, response.content)
+                
+                if article:
+                    return article
+                # A retry may be served a different page, e.g. past a bot check
+                logger.info("Failed to extract content on attempt %d for %s", attempt + 1, url)
+                last_error = "no extractable content"
+                
+        except httpx.TransportError as e:
+            if is_permanent_error(e):
+                logger.warning("Error processing %s: %s", url, e)
+                return None
+            last_error = str(e) or type(e).__name__
+            logger.info("Error on attempt %d for %s: %s", attempt + 1, url, last_error)
         except Exception as e:
-            print(f"Error on attempt {attempt + 1}: {str(e)}")
-            if attempt < max_retries - 1:
-                time.sleep(2)  # Wait before retrying
-            continue
+            last_error = str(e) or type(e).__name__
+            logger.info("Error on attempt %d for %s: %s", attempt + 1, url, last_error)
             
+        if attempt < max_retries - 1:
+            await asyncio.sleep(delay)  # Wait before retrying
+            
+    # Retries are logged at INFO, so say why the page was dropped
+    logger.warning("Giving up on %s after %d attempts (last: %s)", url, max_retries, last_error)
     return None
 
-def save_as_markdown(content, url, output_dir="articles"):
-    """Save the article content as markdown file."""
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
+async def fetch_all(urls, concurrency=20, cache_dir=None, max_retries=3):
+    """Download and extract articles concurrently, returning (url, article) pairs."""
+    sem = asyncio.Semaphore(concurrency)
+    # HTTP/2 multiplexes requests to the same site over one connection
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    # One parse worker per core, but never more workers than pages; a lone
+    # page parses in a thread (pool=None), as starting and feeding a worker
+    # process would cost more than the parse itself
+    workers = max(1, min(os.cpu_count() or 1, len(urls)))
+    batch = len(urls) > 1
+    with ProcessPoolExecutor(max_workers=workers) if batch else nullcontext() as pool:
+        # httpx decodes brotli responses when the brotli package is installed
+        async with httpx.AsyncClient(
+            http2=True, limits=limits, timeout=20.0, headers=_BASE_HEADERS,
+            follow_redirects=True
+        ) as client:
+            articles = await asyncio.gather(
+                *[fetch_article(client, sem, pool, url, max_retries, cache_dir)
+                  for url in urls],
+                return_exceptions=True
+            )
     
-    # Generate filename without timestamp
-    filename = sanitize_filename(url)
+    results = []
+    for url, article in zip(urls, articles):
+        if isinstance(article, BaseException):
+            # Report anything fetch_article did not handle before dropping it
+            logger.error("Error processing %s: %r", url, article)
+            article = None
+        results.append((url, article))
+    return results
+
+def save_as_markdown(content, url, output_dir="articles", filename=None):
+    """Save the article content as markdown file in an existing output directory."""
+    # Generate filename without timestamp unless the caller already has it
+    if filename is None:
+        filename = sanitize_filename(url)
     full_filename = f"{filename}.md"
     filepath = os.path.join(output_dir, full_filename)
     
     # Format the date if available
     date_str = content['publish_date'] if content['publish_date'] else ""
     
-    # Prepare markdown content
-    markdown_content = f"""# {content['title']}
-
-{date_str}
-
-{content['content']}
-
----
-*Extracted from article by {', '.join(content['authors']) if content['authors'] else 'Unknown author'}*
-
-Source: [{url}]({url})
-"""
+    authors = ', '.join(content['authors']) if content['authors'] else 'Unknown author'
     
-    # Save to file
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(markdown_content)
+    # Write the markdown section by section instead of building one large string,
+    # into a temporary file that is renamed into place so an interrupted
+    # run never leaves a truncated article to be skipped next time
+    tmp_filepath = f"{filepath}.tmp"
+    with open(tmp_filepath, 'w', encoding='utf-8') as f:
+        f.writelines((
+            f"# {content['title']}\n\n",
+            f"{date_str}\n\n",
+            content['content'],
+            "\n\n---\n",
+            f"*Extracted from article by {authors}*\n\n",
+            f"Source: [{url}]({url})\n",
+        ))
+    
+    os.replace(tmp_filepath, filepath)
     
     return filepath
 
-def article_exists(url, output_dir):
-    """Check if an article has already been downloaded."""
-    filename = sanitize_filename(url)
-    filepath = os.path.join(output_dir, f"{filename}.md")
-    return os.path.exists(filepath)
+def list_existing_articles(output_dir):
+    """Return the names of articles already saved in the output directory."""
+    try:
+        with os.scandir(output_dir) as entries:
+            return {entry.name[:-3] for entry in entries if entry.name.endswith('.md')}
+    except FileNotFoundError:
+        return set()
+
+def is_tracking_param(name):
+    """Check whether a query parameter only tracks where a click came from."""
+    name = name.lower()
+    return name.startswith(_TRACKING_PARAM_PREFIXES) or name in _TRACKING_PARAMS
 
 def clean_url(url):
-    """Clean and validate a URL."""
-    # Remove any trailing punctuation
-    url = url.rstrip('.,;:!?()[]{}')
-    # Remove any whitespace
-    url = url.strip()
-    # Ensure it starts with http
-    if not url.startswith('http'):
+    """Clean, validate and normalize a URL."""
+    # Remove any whitespace and trailing punctuation
+    parts = urlsplit(url.strip().rstrip('.,;:!?()[]{}'))
+    # Only web URLs that name a host are worth a fetch
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
         return None
         
-    # Parse the URL to handle fragments and query parameters properly
-    parsed = urlparse(url)
-    # Reconstruct the URL without fragments and with cleaned path
-    clean_path = parsed.path.strip('/')
-    if clean_path:
-        # Clean the path component
-        clean_path = "".join(c for c in clean_path if c.isalnum() or c in ('/', '-', '_'))
-        if not clean_path:
-            clean_path = None
-            
-    # Reconstruct the URL
-    if clean_path:
-        url = f"{parsed.scheme}://{parsed.netloc}/{clean_path}"
-    else:
-        url = f"{parsed.scheme}://{parsed.netloc}"
+    try:
+        host = parts.hostname
+        if ':' in host:
+            # IPv6 literal
+            host = f"[{host}]"
+        elif not host.isascii():
+            # Unicode hostnames become their ASCII (punycode) form; ASCII
+            # hosts are left alone, as IDNA2008 rejects real hostnames with
+            # underscores or '--' in positions 3-4
+            host = idna.encode(host, uts46=True).decode('ascii')
+        port = parts.port
+    except (idna.IDNAError, UnicodeError, ValueError):
+        return None
         
-    return url
+    # Canonicalize so variants of one article collapse to a single URL:
+    # no trailing slash, no tracking parameters and no fragment
+    path = parts.path.rstrip('/')
+    query = '&'.join(
+        param for param in parts.query.split('&')
+        if param and not is_tracking_param(param.split('=', 1)[0])
+    )
+    netloc = f"{host}:{port}" if port else host
+    return urlunsplit((parts.scheme, netloc, path, query, ''))
 
-def extract_urls_from_markdown(markdown_file):
-    """Extract URLs from a markdown file."""
-    try:
-        with open(markdown_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+def iter_html_urls(content):
+    """Yield link targets and plain-text URLs from an HTML document."""
+    tree = lxml.html.fromstring(content.encode('utf-8'), parser=_HTML_PARSER)
+    yield from tree.xpath('//a/@href')
+    for text in tree.xpath('//text()'):
+        for match in _URL_ANY.finditer(text):
+            yield match.group('md') or match.group('plain')
+
+def iter_markdown_urls(lines):
+    """Yield markdown link targets and plain URLs, one line at a time."""
+    for line in lines:
+        for match in _URL_ANY.finditer(line):
+            yield match.group('md') or match.group('plain')
+
+def iter_urls_from_markdown(markdown_file):
+    """Lazily yield cleaned URLs from a markdown file, or from an HTML file saved in its place."""
+    with open(markdown_file, 'r', encoding='utf-8') as f:
+        head = f.read(1024).lstrip('\ufeff \t\r\n').lower()
+        f.seek(0)
+        if head.startswith(_HTML_MARKERS):
+            # HTML is not a regular language, so let lxml find the links
+            candidates = iter_html_urls(f.read())
+        else:
+            # Scan line by line so memory stays bounded by the longest line
+            candidates = iter_markdown_urls(f)
             
-        # Find all URLs in markdown format [text](url) or plain URLs
-        urls = set()  # Use set to automatically remove duplicates
-        
-        # Match markdown links [text](url)
-        markdown_links = re.findall(r'\[([^\]]+)\]\(([^)]+)\)', content)
-        for _, url in markdown_links:
-            url = clean_url(url)
-            if url:
-                urls.add(url)
-        
-        # Match plain URLs
-        plain_urls = re.findall(r'https?://[^\s<>"]+', content)
-        for url in plain_urls:
+        for url in candidates:
             url = clean_url(url)
             if url:
-                urls.add(url)
+                yield url
+
+def extract_urls_from_markdown(markdown_file, max_size=None):
+    """Extract URLs from a markdown file, or from an HTML file saved in its place."""
+    try:
+        # Refuse oversized input before reading any of it
+        size = os.path.getsize(markdown_file)
+        if max_size is not None and size > max_size:
+            click.echo(f"Markdown file is {size} bytes, larger than the {max_size} byte limit", err=True)
+            return []
+            
+        # Find all URLs in markdown format [text](url) or plain URLs; the set
+        # removes duplicates as the scan goes, so no match list is ever built
+        urls = set(iter_urls_from_markdown(markdown_file))
         
         # Convert set to sorted list and log the URLs
-        unique_urls = sorted(list(urls))
+        unique_urls = sorted(urls)
         click.echo("\nExtracted URLs:")
         for i, url in enumerate(unique_urls, 1):
             click.echo(f"{i}. {url}")
@@ -203,12 +506,29 @@ def extract_urls_from_markdown(markdown_file):
 @click.command()
 @click.argument('input_source')
 @click.option('--output-dir', default='articles', help='Directory to save markdown files')
-def main(input_source, output_dir):
+@click.option('--max-input-size', default=10 * 1024 * 1024, type=int,
+              help='Largest markdown file to scan for URLs, in bytes')
+@click.option('--concurrency', default=20, type=click.IntRange(min=1),
+              help='Maximum number of articles downloaded at once')
+@click.option('--cache-dir', default=None,
+              help='Directory caching downloaded HTML so re-runs skip the network')
+@click.option('-v', '--verbose', is_flag=True,
+              help='Report every download attempt, even for batches')
+def main(input_source, output_dir, max_input_size, concurrency, cache_dir, verbose):
     """Extract article content from URL or process URLs from a markdown file."""
+    # Libraries keep their default warnings-only output; progress is ours alone
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    
+    # Create the output directories once, up front, rather than per article
+    os.makedirs(output_dir, exist_ok=True)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        
     # Check if input is a file or URL
     if os.path.isfile(input_source):
         click.echo(f"Processing markdown file: {input_source}")
-        urls = extract_urls_from_markdown(input_source)
+        urls = extract_urls_from_markdown(input_source, max_input_size)
         
         if not urls:
             click.echo("No URLs found in the markdown file", err=True)
@@ -216,10 +536,18 @@ def main(input_source, output_dir):
             
         click.echo(f"Found {len(urls)} unique URLs to process")
         
-        # Create a set of already downloaded articles
+        # Per-attempt progress is noise across a batch; keep only the failures
+        if len(urls) > 1 and not verbose:
+            logger.setLevel(logging.WARNING)
+        
+        # Name each URL once and reuse the name for the skip check and the save
+        name_map = unique_filenames(urls)
+        
+        # Create a set of already downloaded articles from a single directory read
+        existing_articles = list_existing_articles(output_dir)
         downloaded_articles = set()
         for url in urls:
-            if article_exists(url, output_dir):
+            if name_map[url] in existing_articles:
                 click.echo(f"Skipping already downloaded article: {url}")
                 downloaded_articles.add(url)
                 continue
@@ -228,18 +556,19 @@ def main(input_source, output_dir):
         urls_to_process = [url for url in urls if url not in downloaded_articles]
         click.echo(f"\nProcessing {len(urls_to_process)} new articles...")
         
-        for url in urls_to_process:
+        results = asyncio.run(fetch_all(urls_to_process, concurrency, cache_dir))
+        
+        for url, article in results:
             click.echo(f"\nProcessing URL: {url}")
-            article = extract_article(url)
             if article:
-                filepath = save_as_markdown(article, url, output_dir)
+                filepath = save_as_markdown(article, url, output_dir, name_map[url])
                 click.echo(f"Article saved to: {filepath}")
             else:
                 click.echo(f"Failed to process URL: {url}", err=True)
     else:
         # Process single URL
         click.echo(f"Processing URL: {input_source}")
-        article = extract_article(input_source)
+        article = extract_article(input_source, cache_dir=cache_dir)
         if not article:
             click.echo("Failed to extract article content", err=True)
             sys.exit(1)